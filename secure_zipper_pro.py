@@ -5,8 +5,7 @@ secure_zipper_pro.py - AES-256暗号化ZIP作成ツール（エンタープラ
 
 機能:
     - AES-256暗号化ZIP作成
-    - 作成後の自動整合性検証
-    - 展開テストによる信頼性保証
+    - 作成後の自動整合性検証（全ファイルを1パスで復号・解凍しHMAC/CRCを確認）
     - 詳細ログ出力（ファイル + コンソール）
     - GUI/CLIハイブリッド対応
     - アトミックファイル操作
@@ -21,7 +20,8 @@ secure_zipper_pro.py - AES-256暗号化ZIP作成ツール（エンタープラ
     python secure_zipper_pro.py document.pdf --level 9 --verify
 
 必要なライブラリ:
-    pip install pyzipper
+    pip install "pyzipper==0.4.0"  # 暗号化バックエンドが内部属性に依存するため固定
+    pip install zlib-ng  # 任意: 圧縮処理の高速化（SIMD版deflate/CRC32）
 
 作成者: Claude (Auto-generated)
 レベル: 4 (エンタープライズ級)
@@ -29,28 +29,48 @@ secure_zipper_pro.py - AES-256暗号化ZIP作成ツール（エンタープラ
 バージョン: 2.0
 """
 
-import argparse
+import atexit
+import hashlib
+import hmac
+import io
 import logging
+import logging.handlers
+import mmap
+import os
+import queue
 import secrets
 import shutil
 import string
 import sys
-import tempfile
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple, Union
 from contextlib import contextmanager
 
 try:
     import pyzipper
+    from pyzipper.zipfile_aes import AESZipEncrypter, WZ_KEY_LENGTHS, WZ_SALT_LENGTHS
+    from Cryptodome.Cipher import AES
+    from Cryptodome.Util import Counter
 except ImportError:
     print("ERROR: 'pyzipper' がインストールされていません")
-    print("実行してください: pip install pyzipper")
+    print('実行してください: pip install "pyzipper==0.4.0"')
     sys.exit(1)
 
+# 高速zlib互換バックエンド（任意）
+try:
+    from zlib_ng import zlib_ng as zlib_backend
+except ImportError:
+    zlib_backend = None
+
+if zlib_backend is not None:
+    # pyzipper（標準zipfile互換）の圧縮・CRC計算を差し替え（出力形式は同一）
+    pyzipper.zipfile.zlib = zlib_backend
+    pyzipper.zipfile.crc32 = zlib_backend.crc32
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 設定クラス
@@ -60,13 +80,24 @@ except ImportError:
 class Config:
     """アプリケーション設定"""
     PASSWORD_LENGTH: int = 16
-    PASSWORD_CHARS: str = string.ascii_letters + string.digits + "!@#$%^&*"
+    PASSWORD_SYMBOLS: str = "!@#$%^&*"
+    PASSWORD_CHARS: str = string.ascii_letters + string.digits + PASSWORD_SYMBOLS
     LOG_FORMAT: str = '%(asctime)s - %(levelname)s - [%(funcName)s] %(message)s'
     DATE_FORMAT: str = '%Y%m%d_%H%M%S'
     DEFAULT_COMPRESSION: int = 6  # 0-9
     VERIFICATION_ENABLED: bool = True
     LOG_DIR: Path = Path("logs")
-    TEMP_DIR_PREFIX: str = "secure_zipper_"
+    MAX_WORKERS: int = os.cpu_count() or 1
+    PARALLEL_SIZE_LIMIT: int = 16 * 1024 * 1024  # これ以上のファイルはメインスレッドで直接書き込み
+    PIPELINE_MEMORY_LIMIT: int = 256 * 1024 * 1024  # 書き込み待ちエントリの合計サイズ上限
+    CHUNK_SIZE: int = 1 << 20  # ストリーム読み書きの単位（1MiB）
+    MMAP_THRESHOLD: int = 64 * 1024  # これ以上のファイルはmmapで読み込み
+    # 圧縮済み形式（deflateしても縮まないため無圧縮で格納、暗号化は行う）
+    INCOMPRESSIBLE_SUFFIXES: frozenset = frozenset({
+        '.jpg', '.jpeg', '.png', '.gif', '.webp',
+        '.mp4', '.mkv', '.webm', '.mov', '.mp3', '.m4a', '.aac', '.ogg',
+        '.zip', '.gz', '.bz2', '.xz', '.7z', '.rar', '.br', '.zst',
+    })
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -74,12 +105,21 @@ class Config:
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 def setup_logging() -> logging.Logger:
-    """ログ設定（ファイル + コンソール）"""
+    """
+    ログ設定（ファイル + コンソール）
+    
+    ハンドラへの書き込みはQueueListenerの別スレッドで行い、
+    アーカイブ処理スレッドではディスクI/Oを発生させない
+    """
+    logger = logging.getLogger(__name__)
+    if logger.handlers:
+        # 再インポート時のハンドラ重複を防止
+        return logger
+    
     Config.LOG_DIR.mkdir(exist_ok=True)
     
-    log_file = Config.LOG_DIR / f"secure_zipper_{datetime.now():%Y%m%d}.log"
+    log_file = Config.LOG_DIR / f"secure_zipper_{time.strftime('%Y%m%d')}.log"
     
-    logger = logging.getLogger(__name__)
     logger.setLevel(logging.INFO)
     
     # ファイルハンドラ
@@ -92,8 +132,15 @@ def setup_logging() -> logging.Logger:
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
     
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # キュー経由で非同期出力（終了時に残りを書き出して停止）
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     return logger
 
@@ -117,16 +164,22 @@ class PasswordGenerator:
         
         Returns:
             str: 生成されたパスワード（英数字+記号）
+        
+        Raises:
+            ValueError: length が3未満の場合
         """
-        alphabet = Config.PASSWORD_CHARS
+        if length < 3:
+            raise ValueError(f"パスワード長は3以上を指定してください: {length}")
         
-        # 最低1つの数字と文字を保証
-        while True:
-            password = ''.join(secrets.choice(alphabet) for _ in range(length))
-            if (any(c.isdigit() for c in password) and 
-                any(c.isalpha() for c in password) and
-                any(c in "!@#$%^&*" for c in password)):
-                return password
+        # 数字・英字・記号を最低1つずつ配置し、残りを全文字種から選んでシャッフル
+        chars = [
+            secrets.choice(string.digits),
+            secrets.choice(string.ascii_letters),
+            secrets.choice(Config.PASSWORD_SYMBOLS),
+        ]
+        chars += [secrets.choice(Config.PASSWORD_CHARS) for _ in range(length - 3)]
+        secrets.SystemRandom().shuffle(chars)
+        return ''.join(chars)
 
 
 class FileVerifier:
@@ -149,18 +202,23 @@ class FileVerifier:
                 # パスワード設定
                 zf.setpassword(password.encode('utf-8'))
                 
-                # ファイル一覧取得
-                file_list = zf.namelist()
-                if not file_list:
+                # ファイル一覧取得（セントラルディレクトリ）
+                infos = zf.infolist()
+                if not infos:
                     return False, "ZIPファイルが空です"
                 
-                # CRCチェック（全ファイル）
-                bad_file = zf.testzip()
-                if bad_file:
-                    return False, f"破損ファイル検出: {bad_file}"
+                # HMAC/CRCチェック（全ファイル、1パス）
+                # 読み込み完了時にpyzipperが検証し、不一致なら BadZipFile
+                for info in infos:
+                    try:
+                        with zf.open(info) as f:
+                            while f.read(Config.CHUNK_SIZE):
+                                pass
+                    except pyzipper.BadZipFile:
+                        return False, f"破損ファイル検出: {info.filename}"
                 
-                logger.info(f"整合性チェック成功: {len(file_list)}個のファイル")
-                return True, f"検証成功（{len(file_list)}ファイル）"
+                logger.info("整合性チェック成功: %d個のファイル", len(infos))
+                return True, f"検証成功（{len(infos)}ファイル）"
                 
         except RuntimeError as e:
             if "Bad password" in str(e):
@@ -168,42 +226,123 @@ class FileVerifier:
             return False, f"検証エラー: {e}"
         except Exception as e:
             return False, f"予期しないエラー: {e}"
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 暗号化バックエンド
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+class OpenSSLAESZipEncrypter(AESZipEncrypter):
+    """
+    WinZip AES-256暗号化（OpenSSLバックエンド）
     
-    @staticmethod
-    def test_extraction(zip_path: Path, password: str) -> Tuple[bool, str]:
+    pyzipper標準実装からの変更点:
+        - 鍵導出: hashlib.pbkdf2_hmac（OpenSSL）
+        - 認証: hmac + SHA1（OpenSSL、SHA拡張命令を自動利用）
+        - 暗号化: pycryptodomex AES-CTR（AES-NIを自動利用）のまま
+    
+    出力形式は標準のWinZip AE-2と完全互換
+    
+    注意: AESZipEncrypter.__init__ を呼ばずに親クラスの属性を直接設定するため、
+    pyzipper 0.4.0 の内部実装に依存する（バージョン固定が必要）
+    """
+    
+    AES_STRENGTH = 3  # 256bit
+    KDF_ITERATIONS = 1000  # WinZip AES仕様で固定
+    
+    def __init__(self, pwd: bytes):
         """
-        実際に展開テストを行う（一時ディレクトリ使用）
+        初期化（エントリごとにソルトと鍵を新規生成）
         
         Args:
-            zip_path: ZIPファイルパス
-            password: パスワード
+            pwd: パスワード（バイト列）
+        """
+        if not pwd:
+            raise RuntimeError("WZ_AES暗号化にはパスワードが必要です")
         
-        Returns:
-            Tuple[bool, str]: (成功/失敗, メッセージ)
+        # 親クラスの compute_aes_version が参照する属性（常にAE-2）
+        self.force_wz_aes_version = None
+        self.conditionally_include_crc = None
+        self.min_bytes_to_include_crc = None
+        
+        self.aes_strength = self.AES_STRENGTH
+        self.salt_length = WZ_SALT_LENGTHS[self.aes_strength]
+        key_length = WZ_KEY_LENGTHS[self.aes_strength]
+        
+        self.salt = secrets.token_bytes(self.salt_length)
+        keymaterial = hashlib.pbkdf2_hmac(
+            'sha1', pwd, self.salt, self.KDF_ITERATIONS, 2 * key_length + 2
+        )
+        
+        self.encpwdverify = keymaterial[2 * key_length:]
+        self.encrypter = AES.new(
+            keymaterial[:key_length],
+            AES.MODE_CTR,
+            counter=Counter.new(nbits=128, little_endian=True)
+        )
+        self.hmac = hmac.new(keymaterial[key_length:2 * key_length], digestmod=hashlib.sha1)
+
+
+class SecureZipWriteFile(pyzipper.zipfile._ZipWriteFile):
+    """
+    エントリ書き込み（OpenSSLAESZipEncrypter使用時はCRC32計算を省略）
+    
+    WinZip AE-2ではCRCを格納しない（常に0）ため、チャンクごとの
+    CRC32計算はデータ全体を1回余分に走査するだけの処理となる
+    
+    CRCが必要なエントリは親クラス（pyzipper 0.4.0 の _ZipWriteFile）の
+    write() をそのまま使う
+    """
+    
+    def __init__(self, zf, zinfo, zip64, encrypter=None):
+        # OpenSSLAESZipEncrypter は常にAE-2（finalize時にAE-1へ変わらない）
+        self._skip_crc = isinstance(encrypter, OpenSSLAESZipEncrypter)
+        super().__init__(zf, zinfo, zip64, encrypter)
+    
+    def write(self, data):
+        if not self._skip_crc or self.closed:
+            return super().write(data)
+        nbytes = len(data)
+        self._file_size += nbytes
+        if self._compressor:
+            data = self._compressor.compress(data)
+        data = self._encrypter.encrypt(data)
+        self._compress_size += len(data)
+        self._fileobj.write(data)
+        return nbytes
+
+
+class SecureAESZipFile(pyzipper.AESZipFile):
+    """AES暗号化ZIP（OpenSSLバックエンド版）"""
+    
+    zipwritefile_cls = SecureZipWriteFile
+    
+    def get_encrypter(self):
+        # 既定設定（AES-256, オプションなし）のみ高速版に差し替え
+        if self.encryption == pyzipper.WZ_AES and not self.encryption_kwargs:
+            return OpenSSLAESZipEncrypter(self.pwd)
+        return super().get_encrypter()
+    
+    def append_entry(self, zinfo: pyzipper.ZipInfo, data: bytes):
         """
-        temp_dir = None
-        try:
-            # 一時ディレクトリ作成
-            temp_dir = tempfile.mkdtemp(prefix=Config.TEMP_DIR_PREFIX)
-            temp_path = Path(temp_dir)
-            
-            with pyzipper.AESZipFile(zip_path, 'r') as zf:
-                zf.setpassword(password.encode('utf-8'))
-                zf.extractall(temp_path)
-            
-            # 展開されたファイル数確認
-            extracted_files = list(temp_path.rglob('*'))
-            file_count = sum(1 for f in extracted_files if f.is_file())
-            
-            logger.info(f"展開テスト成功: {file_count}個のファイルを展開")
-            return True, f"展開テスト成功（{file_count}ファイル）"
-            
-        except Exception as e:
-            return False, f"展開テスト失敗: {e}"
-        finally:
-            # 一時ディレクトリ削除
-            if temp_dir and Path(temp_dir).exists():
-                shutil.rmtree(temp_dir, ignore_errors=True)
+        構築済みエントリ（ローカルヘッダ + 暗号化データ）をそのまま追記
+        
+        Args:
+            zinfo: エントリ情報（header_offsetはここで再設定）
+            data: ローカルヘッダから始まるエントリのバイト列
+        """
+        with self._lock:
+            if self._writing:
+                raise ValueError("書き込みハンドルが開いている間は追記できません")
+            if self._seekable:
+                self.fp.seek(self.start_dir)
+            zinfo.header_offset = self.fp.tell()
+            self._writecheck(zinfo)
+            self._didModify = True
+            self.fp.write(data)
+            self.start_dir = self.fp.tell()
+            self.filelist.append(zinfo)
+            self.NameToInfo[zinfo.filename] = zinfo
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -227,11 +366,11 @@ class SecureArchiver:
         if not self.source_path.exists():
             raise FileNotFoundError(f"指定されたパスが見つかりません: {self.source_path}")
         
-        logger.info(f"対象: {self.source_path} (圧縮レベル: {self.compression_level})")
+        logger.info("対象: %s (圧縮レベル: %d)", self.source_path, self.compression_level)
     
     def _get_output_path(self) -> Path:
         """出力ファイルパス生成"""
-        timestamp = datetime.now().strftime(Config.DATE_FORMAT)
+        timestamp = time.strftime(Config.DATE_FORMAT)
         stem = self.source_path.stem
         parent = self.source_path.parent
         return parent / f"{stem}_{timestamp}_secured.zip"
@@ -247,7 +386,7 @@ class SecureArchiver:
             yield temp_path
             # 成功したらリネーム
             temp_path.replace(final_path)
-            logger.debug(f"アトミック書き込み完了: {final_path.name}")
+            logger.debug("アトミック書き込み完了: %s", final_path.name)
         except Exception:
             # 失敗したら一時ファイル削除
             if temp_path.exists():
@@ -269,12 +408,12 @@ class SecureArchiver:
         pwd_bytes = password.encode('utf-8')
         
         logger.info("=== アーカイブ作成開始 ===")
-        logger.info(f"出力先: {output_path.name}")
+        logger.info("出力先: %s", output_path.name)
         
         # アトミック書き込み
         with self._atomic_write(output_path) as temp_path:
             try:
-                with pyzipper.AESZipFile(
+                with SecureAESZipFile(
                     temp_path,
                     'w',
                     compression=pyzipper.ZIP_DEFLATED,
@@ -288,10 +427,10 @@ class SecureArchiver:
                     else:
                         self._add_folder(zf, self.source_path)
                 
-                logger.info(f"✅ アーカイブ作成完了: {output_path.name}")
+                logger.info("✅ アーカイブ作成完了: %s", output_path.name)
                 
             except Exception as e:
-                logger.error(f"❌ アーカイブ作成失敗: {e}")
+                logger.error("❌ アーカイブ作成失敗: %s", e)
                 raise
         
         # 検証フェーズ
@@ -302,59 +441,200 @@ class SecureArchiver:
         return output_path, password
     
     def _verify_archive(self, zip_path: Path, password: str):
-        """アーカイブ検証実行"""
+        """
+        アーカイブ検証実行
+        
+        整合性チェックで全エントリを復号・解凍してHMAC/CRCを検証する
+        （展開テストに相当する全データの読み込みもこの1パスで兼ねる）
+        """
         
-        # 1. 整合性チェック
         success, msg = FileVerifier.verify_zip_integrity(zip_path, password)
         if not success:
-            logger.error(f"❌ 整合性チェック失敗: {msg}")
+            logger.error("❌ 整合性チェック失敗: %s", msg)
             raise RuntimeError(f"整合性チェック失敗: {msg}")
-        logger.info(f"✅ 整合性チェック: {msg}")
-        
-        # 2. 展開テスト
-        success, msg = FileVerifier.test_extraction(zip_path, password)
-        if not success:
-            logger.error(f"❌ 展開テスト失敗: {msg}")
-            raise RuntimeError(f"展開テスト失敗: {msg}")
-        logger.info(f"✅ 展開テスト: {msg}")
+        logger.info("✅ 整合性チェック: %s", msg)
         
         logger.info("=== 検証完了：すべて正常 ===")
     
-    def _add_file(self, zf: pyzipper.AESZipFile, file_path: Path, arcname: Optional[str] = None):
-        """単一ファイルをZIPに追加"""
+    def _add_file(
+        self,
+        zf: pyzipper.AESZipFile,
+        file_path: Union[str, Path],
+        arcname: Optional[str] = None,
+        st: Optional[os.stat_result] = None
+    ):
+        """
+        単一ファイルをZIPに追加
+        
+        st にフォルダ走査時のstat結果を渡すと、ここでのstat()を省略する
+        1MiB単位でストリーム書き込みするため、ファイルサイズによらず
+        メモリ使用量は一定（ZIP64要否はstatで得たサイズから自動判定）
+        圧縮済み形式（Config.INCOMPRESSIBLE_SUFFIXES）はdeflateを省略
+        Config.MMAP_THRESHOLD 以上のファイルはmmap経由で読み込み、
+        read()によるバイト列へのコピーを省く
+        """
         if arcname is None:
-            arcname = file_path.name
-        zf.write(file_path, arcname=arcname)
-        logger.debug(f"追加: {arcname}")
+            arcname = os.path.basename(file_path)
+        if st is None:
+            st = os.stat(file_path)
+        # ZipInfo.from_file と同じ内容をstat結果から構築（from_fileは内部で再度stat()する）
+        info = zf.zipinfo_cls(arcname, time.localtime(st.st_mtime)[0:6])
+        info.external_attr = (st.st_mode & 0xFFFF) << 16
+        info.file_size = st.st_size
+        if os.path.splitext(file_path)[1].lower() in Config.INCOMPRESSIBLE_SUFFIXES:
+            info.compress_type = pyzipper.ZIP_STORED
+        else:
+            info.compress_type = zf.compression
+        info._compresslevel = zf.compresslevel
+        # 32bit環境ではアドレス空間を使い切らないよう2GiB未満に限定
+        use_mmap = (
+            info.file_size >= Config.MMAP_THRESHOLD
+            and (sys.maxsize > 2**32 or info.file_size < 1 << 31)
+        )
+        with open(file_path, 'rb', buffering=0) as src, zf.open(info, 'w') as dst:
+            if use_mmap:
+                self._copy_mmap(src, dst)
+            else:
+                shutil.copyfileobj(src, dst, Config.CHUNK_SIZE)
+        # ファイルごとに呼ばれるため、DEBUG無効時はLogRecord生成も省略
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("追加: %s", arcname)
     
-    def _add_folder(self, zf: pyzipper.AESZipFile, folder_path: Path):
+    @staticmethod
+    def _copy_mmap(src, dst):
+        """mmapしたファイルをCHUNK_SIZE単位のスライスでコピー（ページキャッシュから直接渡す）"""
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mm) as view:
+                for offset in range(0, len(view), Config.CHUNK_SIZE):
+                    dst.write(view[offset:offset + Config.CHUNK_SIZE])
+    
+    def _build_entry(
+        self,
+        zf: SecureAESZipFile,
+        file_path: str,
+        arcname: str,
+        st: os.stat_result
+    ) -> Tuple[pyzipper.ZipInfo, memoryview]:
+        """
+        1ファイルをメモリ上で圧縮+暗号化（ワーカースレッドで実行）
+        
+        Returns:
+            Tuple[ZipInfo, memoryview]: (エントリ情報, ローカルヘッダ以降のバイト列)
+        """
+        buf = io.BytesIO()
+        with SecureAESZipFile(
+            buf,
+            'w',
+            compression=zf.compression,
+            encryption=zf.encryption,
+            compresslevel=zf.compresslevel
+        ) as entry_zf:
+            entry_zf.setpassword(zf.pwd)
+            self._add_file(entry_zf, file_path, arcname, st)
+            zinfo = entry_zf.filelist[0]
+            end = entry_zf.start_dir
+        return zinfo, buf.getbuffer()[:end]
+    
+    @staticmethod
+    def _iter_files(root: str) -> Iterator[Tuple[os.DirEntry, str]]:
+        """
+        os.scandir によるフォルダ走査（ファイルのみ、走査しながら逐次返す）
+        
+        DirEntryの種別情報はディレクトリ読み込み時に取得済みのため、
+        種別判定のためのstat()は発生しない（サイズ・更新日時が必要な
+        呼び出し側はDirEntry.stat()を1回だけ行い、その結果を使い回す）
+        
+        Args:
+            root: 走査するフォルダ
+        
+        Yields:
+            Tuple[os.DirEntry, str]: (エントリ, ZIP内パス)
+        """
+        stack = [(root, '')]
+        while stack:
+            dir_path, prefix = stack.pop()
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{prefix}{entry.name}/"))
+                    elif entry.is_file():
+                        yield entry, prefix + entry.name
+    
+    def _add_folder(self, zf: SecureAESZipFile, folder_path: Path):
         """
         フォルダを再帰的にZIPに追加
         
+        ワーカースレッドで圧縮+暗号化し、メインスレッドが投入順に書き込む
+        （zlib/AES/HMACはGIL解放されるため複数コアで並列化される）
+        書き込み待ちのエントリは件数（ワーカー数×2）と合計サイズ
+        （Config.PIPELINE_MEMORY_LIMIT）の両方で制限し、メモリ使用量を抑える
+        
         【バグ修正】
         relative_to(folder_path.parent) → relative_to(folder_path)
         これにより、ZIP内のパス構造が正しく保たれる
         """
         file_count = 0
-        for file_path in folder_path.rglob('*'):
-            if file_path.is_file():
-                # 🔧 修正ポイント: folder_path を基準にする
-                arcname = file_path.relative_to(folder_path)
-                zf.write(file_path, arcname=str(arcname))
-                file_count += 1
-                logger.debug(f"追加: {arcname}")
+        pending = deque()  # (future, 元ファイルサイズ) を投入順に保持
+        pending_bytes = 0
+        max_pending = Config.MAX_WORKERS * 2
+        
+        def write_oldest():
+            """最も古い構築済みエントリを書き込む"""
+            nonlocal pending_bytes
+            future, size = pending.popleft()
+            zf.append_entry(*future.result())
+            pending_bytes -= size
+        
+        with ThreadPoolExecutor(max_workers=Config.MAX_WORKERS) as pool:
+            try:
+                # 🔧 修正ポイント: folder_path を基準にしたパスをZIP内パスとする
+                for entry, arcname in self._iter_files(str(folder_path)):
+                    st = entry.stat()  # 1ファイルにつきstat()はこの1回のみ
+                    if st.st_size > Config.PARALLEL_SIZE_LIMIT:
+                        # 大きなファイルは順序を保つため先行分を書き出してから直接追加
+                        while pending:
+                            write_oldest()
+                        self._add_file(zf, entry.path, arcname, st)
+                    else:
+                        # 件数・合計サイズのどちらかが上限を超えたら古い順に書き出す
+                        while pending and (
+                            len(pending) >= max_pending
+                            or pending_bytes + st.st_size > Config.PIPELINE_MEMORY_LIMIT
+                        ):
+                            write_oldest()
+                        future = pool.submit(self._build_entry, zf, entry.path, arcname, st)
+                        pending.append((future, st.st_size))
+                        pending_bytes += st.st_size
+                    file_count += 1
+                
+                while pending:
+                    write_oldest()
+            except Exception:
+                for future, _ in pending:
+                    future.cancel()
+                raise
         
-        logger.info(f"合計 {file_count} 個のファイルを追加")
+        logger.info("合計 %d 個のファイルを追加", file_count)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # GUI実装
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+def _load_tk():
+    """tkinterの遅延インポート（CLIモードの起動を軽くするためGUI起動時のみ読み込む）"""
+    global tk, filedialog, messagebox, ttk
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, ttk
+
+
 class AppGUI:
     """GUIアプリケーション"""
     
     def __init__(self):
+        _load_tk()
         self.root = tk.Tk()
         self.root.title("Secure Zipper Pro v2.0")
         self.root.geometry("450x300")
@@ -460,13 +740,13 @@ class AppGUI:
             
         except Exception as e:
             progress.destroy()
-            logger.error(f"処理エラー: {e}", exc_info=True)
+            logger.error("処理エラー: %s", e, exc_info=True)
             messagebox.showerror(
                 "エラー",
                 f"処理に失敗しました:\n\n{e}\n\n詳細はログファイルを確認してください。"
             )
     
-    def _show_progress(self) -> tk.Toplevel:
+    def _show_progress(self) -> "tk.Toplevel":
         """プログレスバー表示"""
         progress = tk.Toplevel(self.root)
         progress.title("処理中...")
@@ -554,6 +834,8 @@ class AppGUI:
 
 def cli_mode():
     """コマンドラインモード"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="AES-256暗号化ZIP作成ツール（エンタープライズ版）",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -599,7 +881,7 @@ def cli_mode():
         print("\n⚠️  パスワードを安全に保管してください！")
         
     except Exception as e:
-        logger.error(f"処理失敗: {e}", exc_info=True)
+        logger.error("処理失敗: %s", e, exc_info=True)
         print(f"\n❌ ERROR: {e}")
         print(f"\n詳細はログファイルを確認してください: {Config.LOG_DIR}")
         sys.exit(1)